@@ -2,11 +2,13 @@ from .inviter import (
     Event,
     create_invitation,
     fetch_ics,
+    fetch_ics_lines,
     filter_events,
     generate_invites,
     export_calendars,
     export_team_calendars,
     import_invites,
+    iter_filtered_events,
     parse_events,
 )
 
@@ -14,11 +16,13 @@ __all__ = [
     "Event",
     "create_invitation",
     "fetch_ics",
+    "fetch_ics_lines",
     "filter_events",
     "generate_invites",
     "export_calendars",
     "export_team_calendars",
     "import_invites",
+    "iter_filtered_events",
     "parse_events",
 ]
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import os
 from datetime import date, datetime, timezone
 from pathlib import Path
 from typing import Sequence
@@ -9,19 +10,29 @@ from .inviter import export_calendars, export_team_calendars, import_invites
 
 
 def parse_boundary(value: str) -> datetime | date:
-    if "T" in value:
-        try:
-            dt = datetime.fromisoformat(value)
-        except ValueError as exc:
-            raise argparse.ArgumentTypeError(f"Invalid datetime value: {value}") from exc
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt
-
+    # Try the date form first: on Python 3.11+ datetime.fromisoformat also
+    # accepts "YYYY-MM-DD", which would lose the whole-day end boundary.
     try:
         return date.fromisoformat(value)
+    except ValueError:
+        pass
+
+    try:
+        dt = datetime.fromisoformat(value)
     except ValueError as exc:
-        raise argparse.ArgumentTypeError(f"Invalid date value: {value}") from exc
+        raise argparse.ArgumentTypeError(f"Invalid date or datetime value: {value}") from exc
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def default_cache_dir() -> Path:
+    # Resolved only when --cache is used: Path.home() raises when no home
+    # directory is known, which must not break runs without a cache.
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache and os.path.isabs(xdg_cache):
+        return Path(xdg_cache) / "getsGoICS"
+    return Path.home() / ".cache" / "getsGoICS"
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -81,6 +92,15 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Generate separate ICS files for each team (U9, U10, U12.1, U12, mU14, wU14).",
     )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=(
+            "Reuse previously parsed feeds when the server reports them unchanged "
+            "(ETag/Last-Modified). Cache lives in $XDG_CACHE_HOME/getsGoICS "
+            "(default: ~/.cache/getsGoICS)."
+        ),
+    )
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -94,6 +114,7 @@ def main(argv: Sequence[str] | None = None) -> int:
     args = parser.parse_args(argv)
 
     output_dir = Path(args.output_dir)
+    cache_dir = default_cache_dir() if args.cache else None
     if args.exclude_keywords is not None:
         exclude_keywords = args.exclude_keywords
     elif args.team_calendars:
@@ -108,6 +129,7 @@ def main(argv: Sequence[str] | None = None) -> int:
             start=args.start,
             end=args.end,
             exclude_keywords=exclude_keywords,
+            cache_dir=cache_dir,
         )
 
         if not args.quiet:
@@ -125,6 +147,7 @@ def main(argv: Sequence[str] | None = None) -> int:
             start=args.start,
             end=args.end,
             exclude_keywords=exclude_keywords,
+            cache_dir=cache_dir,
         )
 
         if not args.quiet:
@@ -144,6 +167,7 @@ def main(argv: Sequence[str] | None = None) -> int:
         start=args.start,
         end=args.end,
         exclude_keywords=exclude_keywords,
+        cache_dir=cache_dir,
     )
 
     if not args.quiet:
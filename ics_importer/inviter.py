@@ -1,18 +1,33 @@
 from __future__ import annotations
 
+import calendar
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import date, datetime, time, timezone
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+from itertools import combinations
+import hashlib
+import json
+import math
+import os
+import pickle
 import re
 from pathlib import Path
-from typing import Dict, List, Sequence, Set
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
 from urllib.parse import urlparse
 import uuid
+import warnings
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import requests
-from icalendar import Calendar, Event as ICalEvent, vCalAddress, vText
+from requests.adapters import HTTPAdapter
 
+from ._windows_zones import WINDOWS_ZONES
 
-@dataclass
+
+@dataclass(slots=True)
 class Event:
     uid: str
     summary: str
@@ -28,49 +43,69 @@ class Event:
     dtstamp: datetime | None = None
 
 
-def fetch_ics(url: str, timeout: int = 10) -> str:
-    response = requests.get(url, timeout=timeout)
+# Upper bound for concurrent feed downloads; also sizes the connection pool.
+_MAX_FETCH_WORKERS = 8
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=_MAX_FETCH_WORKERS,
+        pool_maxsize=_MAX_FETCH_WORKERS,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared across fetches so feeds on the same host reuse keep-alive connections.
+_SESSION = _new_session()
+
+
+# Returns the whole body for library callers. The orchestrators stream
+# through fetch_ics_lines instead, so that is the fetch hook to patch.
+def fetch_ics(
+    url: str,
+    timeout: int = 10,
+    session: requests.Session | None = None,
+) -> str:
+    session = session or _SESSION
+    response = session.get(url, timeout=timeout)
     response.raise_for_status()
     return response.text
 
 
-def parse_events(ics_text: str) -> List[Event]:
-    calendar = Calendar.from_ical(ics_text)
+def fetch_ics_lines(
+    url: str,
+    timeout: int = 10,
+    session: requests.Session | None = None,
+) -> Iterator[str]:
+    # Streams the body so large feeds can go straight into parse_events
+    # without holding the whole text in memory.
+    session = session or _SESSION
+    response = session.get(url, timeout=timeout, stream=True)
+    try:
+        response.raise_for_status()
+    except requests.HTTPError:
+        response.close()
+        raise
+    return _response_lines(response)
 
-    events: List[Event] = []
-    for component in calendar.walk():
-        if component.name != "VEVENT":
-            continue
 
-        dtstart = component.get("DTSTART")
-        if not dtstart:
-            continue
+def parse_events(ics_text: str | Iterable[str]) -> List[Event]:
+    return list(iter_filtered_events(ics_text))
 
-        start = _ensure_datetime(dtstart.dt)
-        dtend = component.get("DTEND")
-        end = _ensure_datetime(dtend.dt) if dtend else start
-
-        raw_uid = component.get("UID")
-        uid = str(raw_uid) if raw_uid else _generate_uid()
-
-        events.append(
-            Event(
-                uid=uid,
-                summary=_text(component.get("SUMMARY")),
-                description=_text(component.get("DESCRIPTION")),
-                location=_text(component.get("LOCATION")),
-                url=_text(component.get("URL")),
-                start=start,
-                end=end,
-                status=_text(component.get("STATUS")),
-                transparency=_text(component.get("TRANSP")),
-                created=_maybe_datetime(component.get("CREATED")),
-                last_modified=_maybe_datetime(component.get("LAST-MODIFIED")),
-                dtstamp=_maybe_datetime(component.get("DTSTAMP")),
-            )
-        )
 
-    return events
+def iter_filtered_events(
+    ics_text: str | Iterable[str],
+    *,
+    start: datetime | date | None = None,
+    end: datetime | date | None = None,
+    exclude_keywords: Sequence[str] | None = None,
+) -> Iterator[Event]:
+    # Parses and filters in one pass: rejected events are dropped as soon as
+    # DTSTART and SUMMARY are known, before the remaining fields are decoded.
+    return _stream_events(ics_text, _event_filter(start, end, exclude_keywords))
 
 
 def create_invitation(
@@ -78,53 +113,45 @@ def create_invitation(
     attendee_email: str,
     organizer_email: str | None = None,
     attendee_name: str | None = None,
+    *,
+    now: datetime | None = None,
 ) -> str:
-    organizer_email = organizer_email or attendee_email
-    attendee_name = attendee_name or attendee_email
+    return _invitation_bytes(
+        event,
+        attendee_email,
+        organizer_email,
+        attendee_name,
+        now or datetime.now(timezone.utc),
+    ).decode("utf-8")
 
-    calendar = Calendar()
-    calendar.add("prodid", "-//icsImporter//Invite Generator//EN")
-    calendar.add("version", "2.0")
-    calendar.add("calscale", "GREGORIAN")
-    calendar.add("method", "REQUEST")
 
-    component = ICalEvent()
-    component.add("uid", event.uid)
-    if event.summary:
-        component.add("summary", event.summary)
-    if event.description:
-        component.add("description", event.description)
-    if event.location:
-        component.add("location", event.location)
-    if event.url:
-        component.add("url", event.url)
-    if event.status:
-        component.add("status", event.status)
-    if event.transparency:
-        component.add("transp", event.transparency)
-    if event.created:
-        component.add("created", event.created)
-    if event.last_modified:
-        component.add("last-modified", event.last_modified)
-    component.add("dtstamp", datetime.now(timezone.utc))
-    component.add("dtstart", event.start)
-    component.add("dtend", event.end)
-    component.add("sequence", 0)
-
-    organizer = vCalAddress(f"MAILTO:{organizer_email}")
-    organizer.params["cn"] = vText(organizer_email)
-    component.add("organizer", organizer)
-
-    attendee = vCalAddress(f"MAILTO:{attendee_email}")
-    attendee.params["cn"] = vText(attendee_name)
-    attendee.params["role"] = vText("REQ-PARTICIPANT")
-    attendee.params["partstat"] = vText("NEEDS-ACTION")
-    attendee.params["rsvp"] = vText("TRUE")
-    component.add("attendee", attendee)
-
-    calendar.add_component(component)
+def _invitation_bytes(
+    event: Event,
+    attendee_email: str,
+    organizer_email: str | None,
+    attendee_name: str | None,
+    now: datetime,
+) -> bytes:
+    organizer_email = organizer_email or attendee_email
+    attendee_name = attendee_name or attendee_email
 
-    return calendar.to_ical().decode("utf-8")
+    lines = _event_lines(
+        event, now, extra=_invite_extra(organizer_email, attendee_email, attendee_name)
+    )
+    return _INVITE_HEADER + b"".join(map(_fold_line, lines)) + _CALENDAR_END
+
+
+# A batch of invites shares one organizer/attendee, so these lines are built once.
+@lru_cache(maxsize=8)
+def _invite_extra(
+    organizer_email: str, attendee_email: str, attendee_name: str
+) -> Tuple[str, ...]:
+    return (
+        "SEQUENCE:0",
+        f"ORGANIZER;CN={_param_value(organizer_email)}:MAILTO:{organizer_email}",
+        f"ATTENDEE;CN={_param_value(attendee_name)};PARTSTAT=NEEDS-ACTION;"
+        f"ROLE=REQ-PARTICIPANT;RSVP=TRUE:MAILTO:{attendee_email}",
+    )
 
 
 def generate_invites(
@@ -140,18 +167,25 @@ def generate_invites(
 
     written_paths: List[Path] = []
     used_names: set[str] = set()
+    name_counters: Dict[str, int] = defaultdict(int)
+    # One DTSTAMP for the whole batch instead of a clock read per invite.
+    now = datetime.now(timezone.utc)
+
+    # Rendering stays on this thread; the one-file-per-invite writes are
+    # handed to a pool so their syscalls overlap.
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        writes = []
+        for event in events:
+            invite_content = _invitation_bytes(
+                event, attendee_email, organizer_email, attendee_name, now
+            )
+            filename = _build_filename(event.uid, used_names, name_counters)
+            target = output_path / filename
+            writes.append(executor.submit(target.write_bytes, invite_content))
+            written_paths.append(target)
 
-    for event in events:
-        invite_content = create_invitation(
-            event,
-            attendee_email=attendee_email,
-            organizer_email=organizer_email,
-            attendee_name=attendee_name,
-        )
-        filename = _build_filename(event.uid, used_names)
-        target = output_path / filename
-        target.write_text(invite_content, encoding="utf-8")
-        written_paths.append(target)
+        for write in writes:
+            write.result()
 
     return written_paths
 
@@ -162,22 +196,48 @@ def filter_events(
     end: datetime | date | None = None,
     exclude_keywords: Sequence[str] | None = None,
 ) -> List[Event]:
+    keep = _event_filter(start, end, exclude_keywords)
+    return list(_filter_parsed(events, keep))
+
+
+_EventFilter = Callable[[datetime, str], bool]
+
+
+def _event_filter(
+    start: datetime | date | None,
+    end: datetime | date | None,
+    exclude_keywords: Sequence[str] | None,
+) -> _EventFilter | None:
     start_dt = _normalize_boundary(start, is_start=True)
     end_dt = _normalize_boundary(end, is_start=False)
-    exclude_lower = [keyword.lower() for keyword in exclude_keywords or []]
+    exclude_pattern = _keyword_pattern(exclude_keywords)
+    if start_dt is None and end_dt is None and exclude_pattern is None:
+        return None
 
-    filtered: List[Event] = []
-    for event in events:
-        summary_lower = event.summary.lower() if event.summary else ""
-        if exclude_lower and any(keyword in summary_lower for keyword in exclude_lower):
-            continue
-        if start_dt and event.start < start_dt:
-            continue
-        if end_dt and event.start > end_dt:
-            continue
-        filtered.append(event)
+    # Comparing POSIX timestamps is much cheaper than comparing aware
+    # datetimes with different tzinfos; open bounds become +/- infinity.
+    start_ts = start_dt.timestamp() if start_dt else -math.inf
+    end_ts = end_dt.timestamp() if end_dt else math.inf
+
+    def keep(event_start: datetime, summary: str) -> bool:
+        if exclude_pattern and summary and exclude_pattern.search(summary):
+            return False
+        if event_start.tzinfo is None:
+            # Naive starts are UTC, like naive bounds; timestamp() would
+            # read them as local time.
+            event_start = event_start.replace(tzinfo=timezone.utc)
+        return start_ts <= event_start.timestamp() <= end_ts
 
-    return filtered
+    return keep
+
+
+def _filter_parsed(events: Iterable[Event], keep: _EventFilter | None) -> Iterator[Event]:
+    if keep is None:
+        yield from events
+        return
+    for event in events:
+        if keep(event.start, event.summary):
+            yield event
 
 
 def import_invites(
@@ -190,18 +250,12 @@ def import_invites(
     organizer_email: str | None = None,
     attendee_name: str | None = None,
     exclude_keywords: Sequence[str] | None = None,
+    cache_dir: Path | str | None = None,
 ) -> List[Path]:
-    events_by_url = _load_events(urls)
-    all_events = [
-        event for events in events_by_url.values() for event in events
-    ]
+    keep = _event_filter(start, end, exclude_keywords)
+    events_by_url = _load_event_sources(urls, cache_dir, keep)
 
-    filtered = filter_events(
-        all_events,
-        start=start,
-        end=end,
-        exclude_keywords=exclude_keywords,
-    )
+    filtered = [event for events in events_by_url.values() for event in events]
 
     return generate_invites(
         filtered,
@@ -219,71 +273,55 @@ def export_calendars(
     start: datetime | date | None = None,
     end: datetime | date | None = None,
     exclude_keywords: Sequence[str] | None = None,
+    cache_dir: Path | str | None = None,
 ) -> Dict[str, Path]:
-    events_by_url = _load_events(urls)
+    keep = _event_filter(start, end, exclude_keywords)
+    events_by_url = _load_event_sources(urls, cache_dir, keep)
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
     written: Dict[str, Path] = {}
     used_names: set[str] = set()
+    name_counters: Dict[str, int] = defaultdict(int)
+    now = datetime.now(timezone.utc)
 
     for url, events in events_by_url.items():
-        filtered = filter_events(
-            events,
-            start=start,
-            end=end,
-            exclude_keywords=exclude_keywords,
-        )
+        filtered = list(events)
 
         if not filtered:
             continue
 
-        calendar = Calendar()
-        calendar.add("prodid", "-//icsImporter//Calendar Export//EN")
-        calendar.add("version", "2.0")
-        calendar.add("calscale", "GREGORIAN")
-        calendar.add("method", "PUBLISH")
-
-        name = _calendar_name_from_url(url)
-        calendar.add("name", name)
-        calendar.add("x-wr-calname", name)
-
-        for event in filtered:
-            component = ICalEvent()
-            component.add("uid", event.uid)
-            if event.summary:
-                component.add("summary", event.summary)
-            if event.description:
-                component.add("description", event.description)
-            if event.location:
-                component.add("location", event.location)
-            if event.url:
-                component.add("url", event.url)
-            component.add("dtstart", event.start)
-            component.add("dtend", event.end)
-            if event.status:
-                component.add("status", event.status)
-            if event.transparency:
-                component.add("transp", event.transparency)
-            if event.created:
-                component.add("created", event.created)
-            if event.last_modified:
-                component.add("last-modified", event.last_modified)
-            component.add(
-                "dtstamp",
-                event.dtstamp or event.last_modified or event.created or datetime.now(timezone.utc),
-            )
-
-            calendar.add_component(component)
+        header = _calendar_header(
+            "-//icsImporter//Calendar Export//EN",
+            _calendar_name_from_url(url),
+        )
+        body = b"".join(
+            _format_event(event, now) for event in filtered
+        )
 
-        filename = _calendar_filename_from_url(url, used_names)
+        filename = _calendar_filename_from_url(url, used_names, name_counters)
         path = output_path / filename
-        path.write_bytes(calendar.to_ical())
+        path.write_bytes(header + body + _CALENDAR_END)
         written[url] = path
 
     return written
 
 
+_TEAMS = (
+    "U9",
+    "U10",
+    "U11",
+    "U12.1",
+    "U12.2",
+    "wU12",
+    "mU14",
+    "wU14",
+    "Schultraining",
+    "GetsGoStart",
+)
+_TEAMS_FROZENSET = frozenset(_TEAMS)
+
+
 def export_team_calendars(
     urls: Sequence[str],
     output_dir: Path | str,
@@ -291,145 +329,699 @@ def export_team_calendars(
     start: datetime | date | None = None,
     end: datetime | date | None = None,
     exclude_keywords: Sequence[str] | None = None,
+    cache_dir: Path | str | None = None,
 ) -> Dict[str, Path]:
-    events_by_url = _load_events(urls)
+    # Keywords are excluded per team below, so only the date window applies here.
+    events_by_url = _load_event_sources(urls, cache_dir, _event_filter(start, end, None))
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    base_events = [
-        event for events in events_by_url.values() for event in events
-    ]
-
-    filtered_events = filter_events(
-        base_events,
-        start=start,
-        end=end,
-        exclude_keywords=None,
-    )
-
-    teams = ["U9", "U10", "U11", "U12.1", "U12.2", "wU12", "mU14", "wU14", "Schultraining", "GetsGoStart"]
-    team_calendars: Dict[str, Calendar] = {team: _new_team_calendar(team) for team in teams}
-
-    exclude_keywords = exclude_keywords or []
-
-    exclusion_map = {
-        "U9": exclude_keywords,
-        "U10": exclude_keywords,
-        "U11": exclude_keywords,
-        "U12.1": exclude_keywords + ["U12.2"],
-        "U12.2": exclude_keywords + ["U12.1"],
-        "wU12": exclude_keywords,
-        "mU14": exclude_keywords,
-        "wU14": exclude_keywords,
-        "Schultraining": [],
-        "GetsGoStart": [],
+    now = datetime.now(timezone.utc)
+
+    team_events: Dict[str, List[bytes]] = {team: [] for team in _TEAMS}
+
+    # Keywords are lowercased once here and matched against each event's
+    # lowercased summary.
+    exclude_lower = tuple(keyword.lower() for keyword in exclude_keywords or ())
+
+    exclusion_map: Dict[str, Tuple[str, ...]] = {
+        "U9": exclude_lower,
+        "U10": exclude_lower,
+        "U11": exclude_lower,
+        "U12.1": exclude_lower + ("u12.2",),
+        "U12.2": exclude_lower + ("u12.1",),
+        "wU12": exclude_lower,
+        "mU14": exclude_lower,
+        "wU14": exclude_lower,
+        "Schultraining": (),
+        "GetsGoStart": (),
     }
 
-    # Track source URL for each event by UID
-    event_uid_to_url: Dict[str, str] = {}
+    # Each feed is parsed, filtered and routed in a single pass; the source
+    # URL is known here, so there is no need to map events back to it.
     for url, events in events_by_url.items():
+        is_google = _url_kind(url) == "google"
+
         for event in events:
-            event_uid_to_url[event.uid] = url
-    
-    for event in filtered_events:
-        assigned = False
-        event_teams = set(_teams_for_event(event))
-        source_url = event_uid_to_url.get(event.uid, "")
-        is_google = "google" in source_url.lower()
-        
-        # Special case: mU14 from Google Calendar should also go to U12.1
-        if is_google and "mU14" in event_teams:
-            event_teams.add("U12.1")
-        
-        for team in teams:
-            if team in event_teams:
-                if exclusion_map[team] and any(
-                    keyword.lower() in (event.summary or "").lower()
-                    for keyword in exclusion_map[team]
-                ):
+            # Lowercase once; routing and exclusion both work on this copy.
+            summary_lower = event.summary.lower() if event.summary else ""
+            event_teams = _teams_for_summary(summary_lower)
+
+            # Special case: mU14 from Google Calendar should also go to U12.1
+            if is_google and "mU14" in event_teams:
+                event_teams = event_teams | {"U12.1"}
+
+            # Most events match at most a couple of teams, so walk those
+            # instead of every team.
+            for team in event_teams & _TEAMS_FROZENSET:
+                exclusions = exclusion_map[team]
+                if exclusions and any(keyword in summary_lower for keyword in exclusions):
                     continue
-                _append_event(team_calendars[team], event)
-                assigned = True
-        if not assigned:
-            continue
+                _append_event(team_events[team], event, now=now)
 
     written: Dict[str, Path] = {}
-    for team, calendar in team_calendars.items():
-        if not any(component.name == "VEVENT" for component in calendar.walk()):
+    for team, blocks in team_events.items():
+        if not blocks:
             continue
         filename = f"{team}.ics"
         path = output_path / filename
-        path.write_bytes(calendar.to_ical())
+        path.write_bytes(_new_team_calendar(team) + b"".join(blocks) + _CALENDAR_END)
         written[team] = path
 
     return written
 
 
-def _append_event(calendar: Calendar, event: Event) -> None:
-    component = ICalEvent()
-    component.add("uid", event.uid)
-    if event.summary:
+def _append_event(blocks: List[bytes], event: Event, *, now: datetime) -> None:
+    summary = event.summary
+    if summary:
         # Normalize GETSGOstart variations to GetsGoStart
-        summary = re.sub(r"getsgo\s*start", "GetsGoStart", event.summary, flags=re.IGNORECASE)
-        component.add("summary", summary)
+        summary = _RE_GETSGO.sub("GetsGoStart", summary)
+    blocks.append(_format_event(event, now, summary=summary))
+
+
+# Output is emitted directly as RFC 5545 text instead of building icalendar
+# component trees, which dominated export time on large feeds.
+_CALENDAR_END = b"END:VCALENDAR\r\n"
+_FOLD_OCTETS = 75
+_TEXT_ESCAPES = str.maketrans(
+    {"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n", "\r": None}
+)
+_PARAM_QUOTE_CHARS = frozenset(",;: ")
+
+
+def _calendar_lines(prodid: str, method: str, name: str | None = None) -> List[str]:
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{prodid}",
+        "CALSCALE:GREGORIAN",
+        f"METHOD:{method}",
+    ]
+    if name:
+        escaped = _escape_text(name)
+        lines.append(f"NAME:{escaped}")
+        lines.append(f"X-WR-CALNAME:{escaped}")
+    return lines
+
+
+def _calendar_header(prodid: str, name: str) -> bytes:
+    return b"".join(map(_fold_line, _calendar_lines(prodid, "PUBLISH", name)))
+
+
+def _event_lines(
+    event: Event,
+    dtstamp: datetime,
+    *,
+    summary: str | None = None,
+    extra: Sequence[str] = (),
+) -> List[str]:
+    if summary is None:
+        summary = event.summary
+
+    lines = ["BEGIN:VEVENT"]
+    if summary:
+        lines.append(f"SUMMARY:{_escape_text(summary)}")
+    lines.append(f"DTSTART:{_format_datetime(event.start)}")
+    lines.append(f"DTEND:{_format_datetime(event.end)}")
+    lines.append(f"DTSTAMP:{_format_datetime(dtstamp)}")
+    lines.append(f"UID:{_escape_text(event.uid)}")
+    lines.extend(extra)
+    if event.created:
+        lines.append(f"CREATED:{_format_datetime(event.created)}")
     if event.description:
-        component.add("description", event.description)
+        lines.append(f"DESCRIPTION:{_escape_text(event.description)}")
+    if event.last_modified:
+        lines.append(f"LAST-MODIFIED:{_format_datetime(event.last_modified)}")
     if event.location:
-        component.add("location", event.location)
-    if event.url:
-        component.add("url", event.url)
-    component.add("dtstart", event.start)
-    component.add("dtend", event.end)
+        lines.append(f"LOCATION:{_escape_text(event.location)}")
     if event.status:
-        component.add("status", event.status)
+        lines.append(f"STATUS:{_escape_text(event.status)}")
     if event.transparency:
-        component.add("transp", event.transparency)
-    if event.created:
-        component.add("created", event.created)
-    if event.last_modified:
-        component.add("last-modified", event.last_modified)
-    component.add(
-        "dtstamp",
-        event.dtstamp or event.last_modified or event.created or datetime.now(timezone.utc),
+        lines.append(f"TRANSP:{_escape_text(event.transparency)}")
+    if event.url:
+        lines.append(f"URL:{event.url}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def _format_event(
+    event: Event,
+    dtstamp_fallback: datetime,
+    *,
+    summary: str | None = None,
+) -> bytes:
+    dtstamp = event.dtstamp or event.last_modified or event.created or dtstamp_fallback
+    return b"".join(map(_fold_line, _event_lines(event, dtstamp, summary=summary)))
+
+
+def _format_datetime(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    # Formatting the fields directly skips strftime's format parsing and
+    # always pads the year to four digits.
+    return (
+        f"{value.year:04d}{value.month:02d}{value.day:02d}"
+        f"T{value.hour:02d}{value.minute:02d}{value.second:02d}Z"
     )
-    calendar.add_component(component)
 
 
-def _ensure_datetime(value) -> datetime:
-    if isinstance(value, datetime):
-        if value.tzinfo is None:
-            return value.replace(tzinfo=timezone.utc)
+def _escape_text(value: str) -> str:
+    return value.translate(_TEXT_ESCAPES)
+
+
+def _param_value(value: str) -> str:
+    # Double quotes are not allowed inside parameter values.
+    value = value.replace('"', "'")
+    if any(char in _PARAM_QUOTE_CHARS for char in value):
+        return f'"{value}"'
+    return value
+
+
+def _fold_line(line: str) -> bytes:
+    data = line.encode("utf-8")
+    if len(data) <= _FOLD_OCTETS:
+        return data + b"\r\n"
+
+    chunks: List[bytes] = []
+    start = 0
+    limit = _FOLD_OCTETS
+    while len(data) - start > limit:
+        cut = start + limit
+        # Never split inside a multi-byte UTF-8 sequence.
+        while data[cut] & 0xC0 == 0x80:
+            cut -= 1
+        chunks.append(data[start:cut])
+        start = cut
+        # Continuation lines spend one octet on the leading space.
+        limit = _FOLD_OCTETS - 1
+    chunks.append(data[start:])
+    return b"\r\n ".join(chunks) + b"\r\n"
+
+
+# Every invite starts with the same calendar preamble.
+_INVITE_HEADER = b"".join(
+    map(_fold_line, _calendar_lines("-//icsImporter//Invite Generator//EN", "REQUEST"))
+)
+
+
+# Only the VEVENT properties that end up on Event are collected while parsing.
+_EVENT_PROPERTIES = frozenset(
+    {
+        "UID",
+        "SUMMARY",
+        "DESCRIPTION",
+        "LOCATION",
+        "URL",
+        "STATUS",
+        "TRANSP",
+        "DTSTART",
+        "DTEND",
+        "CREATED",
+        "LAST-MODIFIED",
+        "DTSTAMP",
+    }
+)
+_TEXT_UNESCAPE_RE = re.compile(r"\\([\\;,nN])")
+_TEXT_UNESCAPES = {"\\": "\\", ";": ";", ",": ",", "n": "\n", "N": "\n"}
+
+
+def _stream_events(
+    ics_text: str | Iterable[str],
+    keep: _EventFilter | None = None,
+) -> Iterator[Event]:
+    in_vevent = False
+    nested = 0
+    props: Dict[str, Tuple[str, str]] = {}
+    # VTIMEZONE definitions seen so far, for TZIDs that zoneinfo cannot resolve.
+    zones: Dict[str, tzinfo] = {}
+    in_vtimezone = False
+    tzid = ""
+    observances: List[Tuple[str, Dict[str, str]]] = []
+    observance: Dict[str, str] | None = None
+    # Events with a TZID that may be defined by a later VTIMEZONE; once one is
+    # held back, the rest queue behind it so feed order is kept.
+    held: List[Dict[str, Tuple[str, str]]] = []
+
+    for line in _unfold_lines(ics_text):
+        name, params, value = _split_content_line(line)
+
+        if name == "BEGIN":
+            kind = value.upper()
+            if in_vevent:
+                nested += 1
+            elif kind == "VEVENT":
+                in_vevent = True
+                props = {}
+            elif kind == "VTIMEZONE":
+                in_vtimezone = True
+                tzid = ""
+                observances = []
+            elif in_vtimezone and kind in ("STANDARD", "DAYLIGHT"):
+                observance = {}
+                observances.append((kind, observance))
+            continue
+
+        if name == "END":
+            kind = value.upper()
+            if nested:
+                nested -= 1
+            elif in_vevent and kind == "VEVENT":
+                in_vevent = False
+                if held or _has_unresolved_tzid(props, zones):
+                    held.append(props)
+                    continue
+                event = _build_event(props, zones, keep)
+                if event is not None:
+                    yield event
+            elif in_vtimezone and kind == "VTIMEZONE":
+                in_vtimezone = False
+                observance = None
+                zone = _feed_zone(tzid, observances)
+                if zone is not None:
+                    zones[tzid] = zone
+            elif kind in ("STANDARD", "DAYLIGHT"):
+                observance = None
+            elif kind == "VCALENDAR" and not in_vevent:
+                yield from _build_events(held, zones, keep)
+                held = []
+            continue
+
+        # Properties of nested components (e.g. VALARM) must not leak into the event.
+        if in_vevent:
+            if not nested and name in _EVENT_PROPERTIES:
+                props.setdefault(name, (params, value))
+        elif observance is not None:
+            if name == "RDATE" and "RDATE" in observance:
+                observance["RDATE"] += f",{value}"
+            else:
+                observance.setdefault(name, value)
+        elif in_vtimezone and name == "TZID":
+            tzid = value
+
+    yield from _build_events(held, zones, keep)
+
+
+def _has_unresolved_tzid(props: Dict[str, Tuple[str, str]], zones: Dict[str, tzinfo]) -> bool:
+    for params, _ in props.values():
+        tzid = _param(params, "TZID")
+        if tzid and tzid not in zones and _zone(tzid) is None:
+            return True
+    return False
+
+
+def _build_events(
+    held: List[Dict[str, Tuple[str, str]]],
+    zones: Dict[str, tzinfo],
+    keep: _EventFilter | None,
+) -> Iterator[Event]:
+    for props in held:
+        event = _build_event(props, zones, keep)
+        if event is not None:
+            yield event
+
+
+def _unfold_lines(ics_text: str | Iterable[str]) -> Iterator[str]:
+    lines = ics_text.split("\n") if isinstance(ics_text, str) else ics_text
+    current: str | None = None
+    for line in lines:
+        if line.endswith("\r"):
+            line = line[:-1]
+        if not line:
+            continue
+        if line[:1] in (" ", "\t"):
+            if current is not None:
+                current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _response_lines(response: requests.Response) -> Iterator[str]:
+    # Split on "\n" ourselves rather than using iter_lines(), which can emit a
+    # spurious blank line when "\r\n" straddles two chunks.
+    if response.encoding is None:
+        # Without a charset, iter_content would yield bytes; ICS defaults to UTF-8.
+        response.encoding = "utf-8"
+    with response:
+        pending = ""
+        for chunk in response.iter_content(chunk_size=64 * 1024, decode_unicode=True):
+            pending += chunk
+            *lines, pending = pending.split("\n")
+            yield from lines
+        if pending:
+            yield pending
+
+
+def _split_content_line(line: str) -> Tuple[str, str, str]:
+    colon = line.find(":")
+    if colon == -1:
+        return line.upper(), "", ""
+
+    # Quoted parameter values may contain colons, so fall back to a scan.
+    quote = line.find('"', 0, colon)
+    if quote != -1:
+        in_quotes = False
+        for index in range(quote, len(line)):
+            char = line[index]
+            if char == '"':
+                in_quotes = not in_quotes
+            elif char == ":" and not in_quotes:
+                colon = index
+                break
+
+    head = line[:colon]
+    value = line[colon + 1 :]
+    name, _, params = head.partition(";")
+    return name.upper(), params, value
+
+
+def _build_event(
+    props: Dict[str, Tuple[str, str]],
+    zones: Dict[str, tzinfo],
+    keep: _EventFilter | None = None,
+) -> Event | None:
+    dtstart = props.get("DTSTART")
+    if not dtstart or not dtstart[1]:
+        return None
+
+    start = _prop_datetime(props, "DTSTART", zones)
+    summary = _prop_text(props, "SUMMARY")
+    if keep is not None and not keep(start, summary):
+        return None
+
+    end = _prop_datetime(props, "DTEND", zones) or start
+
+    uid = _prop_text(props, "UID") or _generate_uid()
+
+    # Positional, in Event field order.
+    return Event(
+        uid,
+        summary,
+        _prop_text(props, "DESCRIPTION"),
+        _prop_text(props, "LOCATION"),
+        props["URL"][1] if "URL" in props else "",
+        start,
+        end,
+        sys.intern(_prop_text(props, "STATUS")),
+        sys.intern(_prop_text(props, "TRANSP")),
+        _prop_datetime(props, "CREATED", zones),
+        _prop_datetime(props, "LAST-MODIFIED", zones),
+        _prop_datetime(props, "DTSTAMP", zones),
+    )
+
+
+def _prop_text(props: Dict[str, Tuple[str, str]], name: str) -> str:
+    prop = props.get(name)
+    if not prop:
+        return ""
+    value = prop[1]
+    if "\\" not in value:
         return value
+    return _TEXT_UNESCAPE_RE.sub(lambda match: _TEXT_UNESCAPES[match.group(1)], value)
 
-    # Interpret date-only values as all-day events in UTC.
-    return datetime.combine(value, time.min, tzinfo=timezone.utc)
+
+def _prop_datetime(
+    props: Dict[str, Tuple[str, str]],
+    name: str,
+    zones: Dict[str, tzinfo],
+) -> datetime | None:
+    prop = props.get(name)
+    if not prop or not prop[1]:
+        return None
+    params, value = prop
+    tzid = _param(params, "TZID")
+    zone = None
+    if tzid:
+        zone = _zone(tzid) or zones.get(tzid)
+        if zone is None:
+            warnings.warn(
+                f"Unknown TZID {tzid!r} without a VTIMEZONE definition; "
+                "treating its times as UTC",
+                stacklevel=2,
+            )
+    return _fast_parse_ics_dt(value, zone)
+
+
+def _fast_parse_ics_dt(raw: str, zone: tzinfo | None) -> datetime:
+    # DTSTART-style values only come in three shapes, so dispatch on length
+    # instead of trying formats in turn.
+    # Slicing into extended ISO form and using fromisoformat is several times
+    # faster than strptime.
+    raw = raw.strip()
+    size = len(raw)
+    if size == 16 and raw[15] == "Z":
+        return datetime.fromisoformat(
+            f"{raw[:4]}-{raw[4:6]}-{raw[6:8]}T{raw[9:11]}:{raw[11:13]}:{raw[13:15]}+00:00"
+        )
+    if size == 8:
+        # DATE values are interpreted as all-day events in UTC.
+        return datetime.fromisoformat(f"{raw[:4]}-{raw[4:6]}-{raw[6:8]}T00:00:00+00:00")
+    if size == 15 and raw[8] == "T":
+        parsed = datetime.fromisoformat(
+            f"{raw[:4]}-{raw[4:6]}-{raw[6:8]}T{raw[9:11]}:{raw[11:13]}:{raw[13:15]}"
+        )
+        # Floating times and unresolved TZIDs are treated as UTC.
+        return parsed.replace(tzinfo=zone or timezone.utc)
+    raise ValueError(f"Unsupported ICS date-time value: {raw!r}")
+
+
+@lru_cache(maxsize=32)
+def _zone(tzid: str) -> ZoneInfo | None:
+    # Outlook/Exchange feeds use Windows zone names such as
+    # "W. Europe Standard Time".
+    tzid = WINDOWS_ZONES.get(tzid, tzid)
+    try:
+        return ZoneInfo(tzid)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
 
 
-def _build_filename(uid: str, used_names: set[str]) -> str:
-    safe_uid = "".join(char for char in uid if char.isalnum() or char in ("-", "_"))
-    if not safe_uid:
-        safe_uid = "event"
+_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+_BYDAY_RE = re.compile(r"([+-]?[1-5])?(MO|TU|WE|TH|FR|SA|SU)")
+
+
+@dataclass(slots=True)
+class _YearlyRule:
+    month: int
+    # 1..5 or -1..-5 selects that weekday of the month; 0 means the first of
+    # monthdays falling on weekday (e.g. BYMONTHDAY=8,...,14;BYDAY=SU).
+    week: int
+    weekday: int | None
+    monthdays: Tuple[int, ...]
+    until: datetime | None
+
+    def onset(self, year: int, start: datetime) -> datetime | None:
+        if year < start.year:
+            return None
+        day = self._day(year, start.day)
+        if day is None:
+            return None
+        onset = datetime.combine(day, start.time())
+        if onset < start or (self.until is not None and onset > self.until):
+            return None
+        return onset
+
+    def _day(self, year: int, default_day: int) -> date | None:
+        last_day = calendar.monthrange(year, self.month)[1]
+        if self.weekday is None:
+            day = self.monthdays[0] if self.monthdays else default_day
+        elif self.week > 0:
+            first_weekday = date(year, self.month, 1).weekday()
+            day = 1 + (self.weekday - first_weekday) % 7 + 7 * (self.week - 1)
+        elif self.week < 0:
+            last_weekday = date(year, self.month, last_day).weekday()
+            day = last_day - (last_weekday - self.weekday) % 7 + 7 * (self.week + 1)
+        else:
+            matches = [
+                day
+                for day in self.monthdays
+                if day <= last_day and date(year, self.month, day).weekday() == self.weekday
+            ]
+            day = matches[0] if matches else 0
+        return date(year, self.month, day) if 1 <= day <= last_day else None
+
+
+@dataclass(slots=True)
+class _Observance:
+    start: datetime
+    offset_from: timedelta
+    offset_to: timedelta
+    name: str
+    is_dst: bool
+    rule: _YearlyRule | None
+    rdates: Tuple[datetime, ...]
+
+
+class _FeedZone(tzinfo):
+    # A zone defined by the feed's own VTIMEZONE block, used for TZIDs that
+    # are neither IANA nor Windows names. Onsets are compared in local time.
+    def __init__(self, tzid: str, observances: List[_Observance]) -> None:
+        self._tzid = tzid
+        self._observances = observances
+        self._first = min(observances, key=lambda observance: observance.start)
+        self._recurring = [observance for observance in observances if observance.rule]
+        self._fixed = sorted(
+            (
+                (onset, observance)
+                for observance in observances
+                if observance.rule is None
+                for onset in (observance.start, *observance.rdates)
+            ),
+            key=lambda transition: transition[0],
+        )
 
-    candidate = f"{safe_uid}.ics"
-    counter = 1
+    def _observance(self, dt: datetime | None) -> _Observance | None:
+        if dt is None:
+            return None
+        local = dt.replace(tzinfo=None)
+        best: Tuple[datetime, _Observance] | None = None
+        for onset, observance in self._fixed:
+            if onset > local:
+                break
+            best = (onset, observance)
+        # A yearly rule's latest onset is in this year or the previous one.
+        for observance in self._recurring:
+            for year in (local.year - 1, local.year):
+                onset = observance.rule.onset(year, observance.start)
+                if onset is not None and onset <= local and (best is None or onset > best[0]):
+                    best = (onset, observance)
+        return best[1] if best else None
+
+    def utcoffset(self, dt: datetime | None) -> timedelta:
+        observance = self._observance(dt)
+        if observance is None:
+            # Before the first onset the zone's original offset applies.
+            return self._first.offset_from
+        return observance.offset_to
+
+    def dst(self, dt: datetime | None) -> timedelta:
+        observance = self._observance(dt)
+        if observance is None or not observance.is_dst:
+            return timedelta(0)
+        return observance.offset_to - observance.offset_from
+
+    def tzname(self, dt: datetime | None) -> str:
+        observance = self._observance(dt)
+        return (observance.name if observance else "") or self._tzid
+
+    def __repr__(self) -> str:
+        return f"_FeedZone({self._tzid!r})"
+
+    def __reduce__(self):
+        # tzinfo.__reduce__ would rebuild the zone without arguments, which
+        # breaks unpickling cached events.
+        return (_FeedZone, (self._tzid, self._observances))
+
+
+def _feed_zone(tzid: str, observances: List[Tuple[str, Dict[str, str]]]) -> _FeedZone | None:
+    if not tzid:
+        return None
+    parsed: List[_Observance] = []
+    for kind, props in observances:
+        try:
+            parsed.append(_parse_observance(kind, props))
+        except (KeyError, ValueError):
+            # Incomplete or unsupported observances are skipped; the zone is
+            # still usable if another one is valid.
+            continue
+    return _FeedZone(tzid, parsed) if parsed else None
+
+
+def _parse_observance(kind: str, props: Dict[str, str]) -> _Observance:
+    start = _local_datetime(props["DTSTART"])
+    return _Observance(
+        start,
+        _parse_utc_offset(props["TZOFFSETFROM"]),
+        _parse_utc_offset(props["TZOFFSETTO"]),
+        props.get("TZNAME", ""),
+        kind == "DAYLIGHT",
+        _parse_yearly_rule(props["RRULE"], start) if "RRULE" in props else None,
+        tuple(_local_datetime(value) for value in props.get("RDATE", "").split(",") if value),
+    )
+
+
+def _local_datetime(value: str) -> datetime:
+    return _fast_parse_ics_dt(value, None).replace(tzinfo=None)
+
+
+def _parse_utc_offset(value: str) -> timedelta:
+    value = value.strip()
+    if len(value) not in (5, 7) or value[0] not in "+-" or not value[1:].isdigit():
+        raise ValueError(f"Unsupported UTC offset: {value!r}")
+    offset = timedelta(
+        hours=int(value[1:3]), minutes=int(value[3:5]), seconds=int(value[5:7] or 0)
+    )
+    return -offset if value[0] == "-" else offset
+
+
+def _parse_yearly_rule(value: str, start: datetime) -> _YearlyRule:
+    parts = dict(part.partition("=")[::2] for part in value.upper().split(";") if part)
+    if parts.get("FREQ") != "YEARLY":
+        raise ValueError(f"Unsupported VTIMEZONE recurrence: {value!r}")
+
+    week, weekday = 0, None
+    if "BYDAY" in parts:
+        match = _BYDAY_RE.fullmatch(parts["BYDAY"])
+        if match is None:
+            raise ValueError(f"Unsupported VTIMEZONE recurrence: {value!r}")
+        week = int(match.group(1) or 0)
+        weekday = _WEEKDAYS[match.group(2)]
+    monthdays = tuple(int(day) for day in parts.get("BYMONTHDAY", "").split(",") if day)
+    if weekday is not None and not week and not monthdays:
+        raise ValueError(f"Unsupported VTIMEZONE recurrence: {value!r}")
+    until = _local_datetime(parts["UNTIL"]) if "UNTIL" in parts else None
+    return _YearlyRule(int(parts.get("BYMONTH", start.month)), week, weekday, monthdays, until)
+
+
+def _param(params: str, name: str) -> str | None:
+    if not params:
+        return None
+    prefix = f"{name}="
+    for param in params.split(";"):
+        if param.upper().startswith(prefix):
+            return param[len(prefix) :].strip('"')
+    return None
+
+
+# Everything except letters, digits, "_" and "-" is dropped from file names.
+_FILENAME_STRIP = re.compile(r"[^\w-]")
+
+
+def _build_filename(uid: str, used_names: set[str], counters: Dict[str, int]) -> str:
+    safe_uid = _FILENAME_STRIP.sub("", uid) or "event"
+    return _claim_filename(safe_uid, used_names, counters)
+
+
+def _claim_filename(base: str, used_names: set[str], counters: Dict[str, int]) -> str:
+    # counters remembers the last suffix handed out per base name, so repeated
+    # UIDs continue from there instead of re-probing base_2, base_3, ...
+    counters[base] += 1
+    counter = counters[base]
+    candidate = f"{base}.ics" if counter == 1 else f"{base}_{counter}.ics"
     while candidate in used_names:
         counter += 1
-        candidate = f"{safe_uid}_{counter}.ics"
+        candidate = f"{base}_{counter}.ics"
+    counters[base] = counter
 
     used_names.add(candidate)
     return candidate
 
 
-def _text(value) -> str:
-    if not value:
-        return ""
-    return str(value)
-
-
 def _generate_uid() -> str:
     return f"generated-{uuid.uuid4()}"
 
 
+def _keyword_pattern(keywords: Sequence[str] | None) -> re.Pattern[str] | None:
+    # One case-insensitive alternation instead of lowercasing every summary.
+    if not keywords:
+        return None
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+
 def _normalize_boundary(value, *, is_start: bool) -> datetime | None:
     if value is None:
         return None
@@ -443,17 +1035,56 @@ def _normalize_boundary(value, *, is_start: bool) -> datetime | None:
     raise TypeError("Boundary must be a date or datetime")
 
 
-def _maybe_datetime(value) -> datetime | None:
-    if not value:
-        return None
-    dt = value.dt if hasattr(value, "dt") else value
-    return _ensure_datetime(dt)
+_RE_NUM = re.compile(r"\d+(?:\.\d+)?")
+_RE_COMBO_14 = re.compile(r"\s*[/\-]\s*14\b")
+_RE_GETSGO = re.compile(r"getsgo\s*start", re.IGNORECASE)
+_TEAM_NUMBERS = frozenset({"9", "10", "11", "12", "12.1", "12.2"})
+# Every team rule needs one of these substrings: all age groups (9-14)
+# contain a "1" or "9", the rest are matched by keyword.
+_TEAM_TRIGGERS = ("1", "9", "schultraining", "getsgo")
+_NUMBER_TO_TEAMS = {
+    "9": ("U9",),
+    "10": ("U10",),
+    "11": ("U11",),
+    "12.1": ("U12.1",),
+    "12.2": ("U12.2",),
+    # A bare 12 covers both squads unless one of them is named explicitly.
+    "12": ("U12.1", "U12.2"),
+}
+# U11/12 events should also go to wU12
+_COMBO_RULES = {frozenset({"11", "12"}): ("wU12",)}
+
+
+def _teams_for_numbers(numbers: frozenset[str]) -> frozenset[str]:
+    teams: Set[str] = set()
+    for number in numbers:
+        if number == "12" and ("12.1" in numbers or "12.2" in numbers):
+            continue
+        teams.update(_NUMBER_TO_TEAMS[number])
+    for combo, combo_teams in _COMBO_RULES.items():
+        if combo <= numbers:
+            teams.update(combo_teams)
+    return frozenset(teams)
+
+
+# Every subset of _TEAM_NUMBERS, resolved once at import time.
+_NUMBER_SET_TEAMS = {
+    key: _teams_for_numbers(key)
+    for size in range(len(_TEAM_NUMBERS) + 1)
+    for key in map(frozenset, combinations(_TEAM_NUMBERS, size))
+}
 
 
 def _teams_for_event(event: Event) -> List[str]:
-    summary = (event.summary or "").lower()
-    if not summary:
-        return []
+    return sorted(_teams_for_summary((event.summary or "").lower()))
+
+
+# Routing depends only on the lowercased summary, and recurring trainings
+# repeat the same few summaries across a feed.
+@lru_cache(maxsize=1024)
+def _teams_for_summary(summary: str) -> frozenset[str]:
+    if not any(trigger in summary for trigger in _TEAM_TRIGGERS):
+        return frozenset()
 
     teams: Set[str] = set()
 
@@ -463,44 +1094,57 @@ def _teams_for_event(event: Event) -> List[str]:
     if "getsgo" in summary and "start" in summary:
         teams.add("GetsGoStart")
 
-    if re.search(r"\bx\s*(?:u)?14\b", summary):
-        teams.update({"mU14", "wU14"})
-
-    if re.search(r"\bm\s*(?:u)?14\b", summary):
-        teams.add("mU14")
-
-    if re.search(r"\bw\s*(?:u)?14\b", summary):
-        teams.add("wU14")
-
-    if re.search(r"\bw\s*(?:u)?12\s*[/\-]\s*14\b", summary):
-        teams.update({"wU12", "wU14"})
-    elif re.search(r"\bw\s*(?:u)?12\b", summary):
-        teams.add("wU12")
-
+    # One scan over the numeric tokens; gendered age groups (mU14, w 12,
+    # xU14, wU12/14) are recognised from the characters around the token.
     numbers: Set[str] = set()
-    for match in re.finditer(r"\d+(?:\.\d+)?", summary):
+    for match in _RE_NUM.finditer(summary):
         value = match.group(0)
-        if value in {"9", "10", "11", "12", "12.1", "12.2"}:
+        if value in _TEAM_NUMBERS:
             numbers.add(value)
 
-    if "9" in numbers:
-        teams.add("U9")
-    if "10" in numbers:
-        teams.add("U10")
-    if "11" in numbers:
-        teams.add("U11")
-    if "12.1" in numbers:
-        teams.add("U12.1")
-    if "12.2" in numbers:
-        teams.add("U12.2")
-    if "12" in numbers and "12.1" not in numbers and "12.2" not in numbers:
-        teams.update({"U12.1", "U12.2"})
-    
-    # U11/12 events should also go to wU12
-    if "11" in numbers and "12" in numbers:
-        teams.add("wU12")
-
-    return sorted(teams)
+        age_start = match.start()
+        age_end = age_start + 2
+        age = summary[age_start:age_end]
+        if age not in ("12", "14"):
+            continue
+        if age_end < len(summary) and _is_word_char(summary[age_end]):
+            continue
+
+        prefix = _age_prefix(summary, age_start)
+        if prefix is None:
+            continue
+        if age == "14":
+            if prefix in "xm":
+                teams.add("mU14")
+            if prefix in "xw":
+                teams.add("wU14")
+        elif prefix == "w":
+            teams.add("wU12")
+            if _RE_COMBO_14.match(summary, age_end):
+                teams.add("wU14")
+
+    if numbers:
+        teams.update(_NUMBER_SET_TEAMS[frozenset(numbers)])
+
+    return frozenset(teams)
+
+
+def _age_prefix(summary: str, index: int) -> str | None:
+    # Walks back over an optional "u" and whitespace to a standalone m/w/x,
+    # i.e. the ``\b[mwx]\s*u?`` in front of an age such as "mU14" or "w 12".
+    if index and summary[index - 1] == "u":
+        index -= 1
+    while index and summary[index - 1].isspace():
+        index -= 1
+    if not index or summary[index - 1] not in "mwx":
+        return None
+    if index >= 2 and _is_word_char(summary[index - 2]):
+        return None
+    return summary[index - 1]
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
 
 
 def _event_matches_team(event: Event, team: str) -> bool:
@@ -508,57 +1152,192 @@ def _event_matches_team(event: Event, team: str) -> bool:
     return team in teams
 
 
-def _new_team_calendar(team: str) -> Calendar:
-    calendar = Calendar()
-    calendar.add("prodid", "-//icsImporter//Team Calendar Export//EN")
-    calendar.add("version", "2.0")
-    calendar.add("calscale", "GREGORIAN")
-    calendar.add("method", "PUBLISH")
-    name = f"Team {team}"
-    calendar.add("name", name)
-    calendar.add("x-wr-calname", name)
-    return calendar
+def _new_team_calendar(team: str) -> bytes:
+    return _calendar_header("-//icsImporter//Team Calendar Export//EN", f"Team {team}")
 
 
-def _load_events(urls: Sequence[str]) -> Dict[str, List[Event]]:
+def _load_event_sources(
+    urls: Sequence[str],
+    cache_dir: Path | str | None,
+    keep: _EventFilter | None,
+) -> Dict[str, Iterable[Event]]:
+    if cache_dir is not None:
+        # Cached events are stored unfiltered so any window can reuse them.
+        return {
+            url: _filter_parsed(events, keep)
+            for url, events in _load_cached_events(urls, Path(cache_dir)).items()
+        }
+    return _fetch_events(urls, keep)
+
+
+def _fetch_events(urls: Sequence[str], keep: _EventFilter | None) -> Dict[str, List[Event]]:
     events_by_url: Dict[str, List[Event]] = {}
-    for url in urls:
-        ics_text = fetch_ics(url)
-        events_by_url[url] = parse_events(ics_text)
+    # A URL listed twice is downloaded once; results are keyed by URL anyway.
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return events_by_url
+
+    # Downloads are I/O-bound, so fetch all feeds concurrently; results are
+    # collected in input order.
+    with ThreadPoolExecutor(max_workers=min(len(urls), _MAX_FETCH_WORKERS)) as executor:
+        futures = [executor.submit(_fetch_feed_events, url, keep) for url in urls]
+        for url, future in zip(urls, futures):
+            events_by_url[url] = future.result()
     return events_by_url
 
 
-def _calendar_name_from_url(url: str) -> str:
-    parsed = urlparse(url)
-    hostname = (parsed.hostname or "").lower()
+def _fetch_feed_events(url: str, keep: _EventFilter | None) -> List[Event]:
+    # Each worker parses and filters its feed while the body streams in, so
+    # only the kept events are held in memory, never the full response text.
+    return list(_stream_events(fetch_ics_lines(url), keep))
+
+
+@lru_cache(maxsize=64)
+def _url_kind(url: str) -> str:
+    hostname = (urlparse(url).hostname or "").lower()
     if "google" in hostname:
-        return "Google Calendar"
+        return "google"
     if "vereinsplaner" in hostname:
+        return "vereinsplaner"
+    return "other"
+
+
+def _calendar_name_from_url(url: str) -> str:
+    kind = _url_kind(url)
+    if kind == "google":
+        return "Google Calendar"
+    if kind == "vereinsplaner":
         return "Vereinsplaner"
-    stem = Path(parsed.path).stem or "Calendar"
+    stem = Path(urlparse(url).path).stem or "Calendar"
     return stem
 
 
-def _calendar_filename_from_url(url: str, used: set[str]) -> str:
-    parsed = urlparse(url)
-    hostname = (parsed.hostname or "").lower()
-    if "google" in hostname:
-        base = "google"
-    elif "vereinsplaner" in hostname:
-        base = "vereinsplaner"
+def _calendar_filename_from_url(
+    url: str,
+    used: set[str],
+    counters: Dict[str, int],
+) -> str:
+    kind = _url_kind(url)
+    if kind == "other":
+        base = Path(urlparse(url).path).stem or "calendar"
     else:
-        base = Path(parsed.path).stem or "calendar"
+        base = kind
 
-    base = "".join(char for char in base if char.isalnum() or char in ("-", "_"))
-    if not base:
-        base = "calendar"
+    base = _FILENAME_STRIP.sub("", base) or "calendar"
+    return _claim_filename(base, used, counters)
 
-    candidate = f"{base}.ics"
-    counter = 1
-    while candidate in used:
-        counter += 1
-        candidate = f"{base}_{counter}.ics"
 
-    used.add(candidate)
-    return candidate
+# On-disk cache for repeated runs: feeds.json keeps each feed's validators and
+# points at a pickle of its parsed events, reused on "304 Not Modified".
+_CACHE_INDEX = "feeds.json"
 
+
+def _load_cached_events(urls: Sequence[str], cache_dir: Path) -> Dict[str, List[Event]]:
+    events_by_url: Dict[str, List[Event]] = {}
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return events_by_url
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    index_path = cache_dir / _CACHE_INDEX
+    index = _read_cache_index(index_path)
+    # Only revalidate feeds whose parsed events are still on disk.
+    validators = {
+        url: index[url]
+        for url in urls
+        if index.get(url, {}).get("events") and (cache_dir / index[url]["events"]).exists()
+    }
+
+    with ThreadPoolExecutor(max_workers=min(len(urls), _MAX_FETCH_WORKERS)) as executor:
+        futures = [
+            executor.submit(_load_cached_feed, url, validators.get(url), cache_dir)
+            for url in urls
+        ]
+        for url, future in zip(urls, futures):
+            events, entry = future.result()
+            if entry is not None:
+                index[url] = entry
+            events_by_url[url] = events
+
+    index_path.write_text(json.dumps(index, indent=2, sort_keys=True), encoding="utf-8")
+    return events_by_url
+
+
+def _load_cached_feed(
+    url: str,
+    validators: Dict[str, str | None] | None,
+    cache_dir: Path,
+) -> Tuple[List[Event], Dict[str, str | None] | None]:
+    # Returns the feed's events and, when it was downloaded, its new index entry.
+    response = _fetch_conditional(url, validators)
+    if response.status_code == 304:
+        response.close()
+        # Only a 304 to our own validators means the stored events are
+        # current; anything else is refetched unconditionally.
+        events = _read_cached_events(cache_dir / validators["events"]) if validators else None
+        if events is not None:
+            return events, None
+        response = _fetch_conditional(url, None)
+        if response.status_code == 304:
+            response.close()
+            raise requests.HTTPError(
+                f"Unexpected 304 Not Modified for unconditional request: {url}",
+                response=response,
+            )
+
+    try:
+        response.raise_for_status()
+    except requests.HTTPError:
+        response.close()
+        raise
+    # Parsed while the body streams in, as in _fetch_feed_events.
+    events = parse_events(_response_lines(response))
+    events_name = f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]}.pickle"
+    (cache_dir / events_name).write_bytes(pickle.dumps(events))
+    entry = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "events": events_name,
+    }
+    return events, entry
+
+
+def _fetch_conditional(
+    url: str,
+    validators: Dict[str, str | None] | None,
+    timeout: int = 10,
+) -> requests.Response:
+    headers: Dict[str, str] = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return _SESSION.get(url, timeout=timeout, headers=headers, stream=True)
+
+
+def _read_cache_index(path: Path) -> Dict[str, Dict[str, str | None]]:
+    try:
+        index = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict):
+        return {}
+    return {url: entry for url, entry in index.items() if isinstance(entry, dict)}
+
+
+def _read_cached_events(path: Path) -> List[Event] | None:
+    # A missing, damaged or incompatible entry (bad protocol, moved module,
+    # changed class, ...) just means the feed is fetched again.
+    try:
+        return pickle.loads(path.read_bytes())
+    except (
+        OSError,
+        EOFError,
+        pickle.UnpicklingError,
+        ValueError,
+        AttributeError,
+        ImportError,
+        TypeError,
+    ):
+        return None
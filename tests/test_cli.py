@@ -1,5 +1,6 @@
+import argparse
 import sys
-from datetime import date
+from datetime import date, datetime, timezone
 from pathlib import Path
 
 import pytest
@@ -9,6 +10,15 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from ics_importer import cli
 
 
+def test_parse_boundary_accepts_dates_and_datetimes():
+    assert cli.parse_boundary("2025-01-01") == date(2025, 1, 1)
+    assert cli.parse_boundary("2025-01-01T10:30") == datetime(
+        2025, 1, 1, 10, 30, tzinfo=timezone.utc
+    )
+    with pytest.raises(argparse.ArgumentTypeError):
+        cli.parse_boundary("not-a-date")
+
+
 def test_main_invokes_import_with_filters(monkeypatch, tmp_path: Path):
     captured = {}
 
@@ -21,6 +31,7 @@ def test_main_invokes_import_with_filters(monkeypatch, tmp_path: Path):
         organizer_email,
         attendee_name,
         exclude_keywords,
+        cache_dir,
     ):
         captured.update(
             {
@@ -32,6 +43,7 @@ def test_main_invokes_import_with_filters(monkeypatch, tmp_path: Path):
                 "organizer_email": organizer_email,
                 "attendee_name": attendee_name,
                 "exclude_keywords": exclude_keywords,
+                "cache_dir": cache_dir,
             }
         )
         return [Path(output_dir) / "dummy.ics"]
@@ -66,6 +78,7 @@ def test_main_invokes_import_with_filters(monkeypatch, tmp_path: Path):
     assert captured["start"] == date(2025, 1, 1)
     assert captured["end"] == date(2025, 12, 31)
     assert captured["exclude_keywords"] == ["U9", "U10", "Schultraining"]
+    assert captured["cache_dir"] is None
 
 
 def test_main_allows_missing_dates(monkeypatch, tmp_path: Path):
@@ -80,11 +93,17 @@ def test_main_allows_missing_dates(monkeypatch, tmp_path: Path):
         organizer_email,
         attendee_name,
         exclude_keywords,
+        cache_dir,
     ):
         captured.update({"start": start, "end": end, "exclude_keywords": exclude_keywords})
         return []
 
+    def no_home():
+        raise RuntimeError("Could not determine home directory.")
+
     monkeypatch.setattr(cli, "import_invites", fake_import_invites)
+    # Without --cache the home directory must never be needed.
+    monkeypatch.setattr(Path, "home", staticmethod(no_home))
 
     args = [
         "--attendee-email",
@@ -111,6 +130,7 @@ def test_main_aggregate_mode(monkeypatch, tmp_path: Path):
         start,
         end,
         exclude_keywords,
+        cache_dir,
     ):
         captured.update(
             {
@@ -119,6 +139,7 @@ def test_main_aggregate_mode(monkeypatch, tmp_path: Path):
                 "start": start,
                 "end": end,
                 "exclude_keywords": exclude_keywords,
+                "cache_dir": cache_dir,
             }
         )
         return {urls[0]: Path(output_dir) / "vereinsplaner.ics"}
@@ -160,6 +181,7 @@ def test_main_team_calendars(monkeypatch, tmp_path: Path):
         start,
         end,
         exclude_keywords,
+        cache_dir,
     ):
         captured.update(
             {
@@ -168,6 +190,7 @@ def test_main_team_calendars(monkeypatch, tmp_path: Path):
                 "start": start,
                 "end": end,
                 "exclude_keywords": exclude_keywords,
+                "cache_dir": cache_dir,
             }
         )
         return {"U9": Path(output_dir) / "U9.ics"}
@@ -179,11 +202,13 @@ def test_main_team_calendars(monkeypatch, tmp_path: Path):
         raise AssertionError("export_calendars should not be called in team mode")
 
     monkeypatch.setattr(cli, "export_team_calendars", fake_export_team_calendars)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
     monkeypatch.setattr(cli, "import_invites", fail_import_invites)
     monkeypatch.setattr(cli, "export_calendars", fail_export_calendars)
 
     args = [
         "--team-calendars",
+        "--cache",
         "--attendee-email",
         "user@example.com",
         "--output-dir",
@@ -203,4 +228,5 @@ def test_main_team_calendars(monkeypatch, tmp_path: Path):
     assert captured["start"] == date(2025, 12, 1)
     assert captured["end"] == date(2025, 12, 31)
     assert captured["exclude_keywords"] == ["Schultraining"]
+    assert captured["cache_dir"] == tmp_path / "xdg" / "getsGoICS"
 
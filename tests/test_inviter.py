@@ -1,6 +1,9 @@
+import re
 import sys
 import textwrap
-from datetime import datetime, timezone
+import time
+import warnings
+from datetime import date, datetime, timezone
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -13,17 +16,45 @@ from ics_importer.inviter import (
     export_calendars,
     export_team_calendars,
     fetch_ics,
+    fetch_ics_lines,
     filter_events,
     generate_invites,
     import_invites,
+    iter_filtered_events,
     parse_events,
 )
 
 
+_UNFOLD_RE = re.compile(r"\r?\n ")
+
+
 def unfold_ics(text: str) -> str:
-    text = text.replace("\r\n ", "")
-    text = text.replace("\n ", "")
-    return text.replace("\r\n", "\n")
+    return _UNFOLD_RE.sub("", text).replace("\r\n", "\n")
+
+
+class StreamingResponse:
+    encoding = "utf-8"
+
+    def __init__(self, status_code: int = 200, body: str = ""):
+        self.status_code = status_code
+        self.body = body
+        self.headers = {"ETag": '"v1"'}
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size, decode_unicode):
+        # Tiny chunks so CRLF pairs and content lines straddle chunk boundaries.
+        return (self.body[index : index + 7] for index in range(0, len(self.body), 7))
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
 
 
 def test_fetch_ics(monkeypatch):
@@ -41,7 +72,7 @@ def test_fetch_ics(monkeypatch):
         captured["timeout"] = timeout
         return DummyResponse("body")
 
-    monkeypatch.setattr("ics_importer.inviter.requests.get", fake_get)
+    monkeypatch.setattr("ics_importer.inviter._SESSION.get", fake_get)
 
     result = fetch_ics("https://example.com/calendar.ics")
 
@@ -51,57 +82,113 @@ def test_fetch_ics(monkeypatch):
     assert captured["raised"]
 
 
+def test_fetch_ics_lines_streams_into_parse_events(monkeypatch):
+    def fake_get(url, timeout, stream):
+        assert stream
+        return StreamingResponse(body=sample_ics().replace("\n", "\r\n"))
+
+    monkeypatch.setattr("ics_importer.inviter._SESSION.get", fake_get)
+
+    events = parse_events(fetch_ics_lines("https://example.com/calendar.ics"))
+
+    assert [event.uid for event in events] == ["123", "124"]
+    assert events[0].description == "Event description"
+
+
+_SAMPLE_ICS = textwrap.dedent(
+    """\
+    BEGIN:VCALENDAR
+    VERSION:2.0
+    PRODID:-//Example Corp.//Calendar 1.0//EN
+    BEGIN:VEVENT
+    UID:123
+    DTSTART:20241201T140000Z
+    DTEND:20241201T150000Z
+    SUMMARY:Sample Event
+    DESCRIPTION:Event description
+    LOCATION:Virtual
+    URL:https://example.com/events/123
+    STATUS:CONFIRMED
+    TRANSP:OPAQUE
+    CREATED:20231201T120000Z
+    LAST-MODIFIED:20231202T130000Z
+    END:VEVENT
+    BEGIN:VEVENT
+    UID:124
+    DTSTART:20241202T100000Z
+    DTEND:20241202T120000Z
+    SUMMARY:Second Event
+    END:VEVENT
+    END:VCALENDAR
+    """
+)
+
+
 def sample_ics():
-    return textwrap.dedent(
-        """\
-        BEGIN:VCALENDAR
-        VERSION:2.0
-        PRODID:-//Example Corp.//Calendar 1.0//EN
-        BEGIN:VEVENT
-        UID:123
-        DTSTART:20241201T140000Z
-        DTEND:20241201T150000Z
-        SUMMARY:Sample Event
-        DESCRIPTION:Event description
-        LOCATION:Virtual
-        URL:https://example.com/events/123
-        STATUS:CONFIRMED
-        TRANSP:OPAQUE
-        CREATED:20231201T120000Z
-        LAST-MODIFIED:20231202T130000Z
-        END:VEVENT
-        BEGIN:VEVENT
-        UID:124
-        DTSTART:20241202T100000Z
-        DTEND:20241202T120000Z
-        SUMMARY:Second Event
-        END:VEVENT
-        END:VCALENDAR
-        """
-    )
+    return _SAMPLE_ICS
+
+
+_GOOGLE_SAMPLE_ICS = textwrap.dedent(
+    """\
+    BEGIN:VCALENDAR
+    VERSION:2.0
+    PRODID:-//Google Inc//Google Calendar 70.9054//EN
+    BEGIN:VEVENT
+    UID:google-2025
+    DTSTART:20250301T100000Z
+    DTEND:20250301T120000Z
+    SUMMARY:Google Event 2025
+    END:VEVENT
+    BEGIN:VEVENT
+    UID:google-2026
+    DTSTART:20260301T100000Z
+    DTEND:20260301T120000Z
+    SUMMARY:Google Event 2026
+    END:VEVENT
+    END:VCALENDAR
+    """
+)
 
 
 def google_sample_ics():
-    return textwrap.dedent(
-        """\
-        BEGIN:VCALENDAR
-        VERSION:2.0
-        PRODID:-//Google Inc//Google Calendar 70.9054//EN
-        BEGIN:VEVENT
-        UID:google-2025
-        DTSTART:20250301T100000Z
-        DTEND:20250301T120000Z
-        SUMMARY:Google Event 2025
-        END:VEVENT
-        BEGIN:VEVENT
-        UID:google-2026
-        DTSTART:20260301T100000Z
-        DTEND:20260301T120000Z
-        SUMMARY:Google Event 2026
-        END:VEVENT
-        END:VCALENDAR
-        """
-    )
+    return _GOOGLE_SAMPLE_ICS
+
+
+# Custom/Club is only defined by the feed, and only after the event using it.
+_CLUB_ICS = textwrap.dedent(
+    """\
+    BEGIN:VCALENDAR
+    VERSION:2.0
+    BEGIN:VEVENT
+    UID:summer
+    DTSTART;TZID=Custom/Club:20250701T093000
+    END:VEVENT
+    BEGIN:VEVENT
+    UID:utc
+    DTSTART:20250702T093000Z
+    END:VEVENT
+    BEGIN:VTIMEZONE
+    TZID:Custom/Club
+    BEGIN:STANDARD
+    DTSTART:16010101T030000
+    TZOFFSETFROM:+0200
+    TZOFFSETTO:+0100
+    RRULE:FREQ=YEARLY;BYDAY=-1SU;BYMONTH=10
+    END:STANDARD
+    BEGIN:DAYLIGHT
+    DTSTART:16010101T020000
+    TZOFFSETFROM:+0100
+    TZOFFSETTO:+0200
+    RRULE:FREQ=YEARLY;BYDAY=-1SU;BYMONTH=3
+    END:DAYLIGHT
+    END:VTIMEZONE
+    END:VCALENDAR
+    """
+)
+
+
+def club_ics():
+    return _CLUB_ICS
 
 
 def test_parse_events_returns_dataclasses():
@@ -136,6 +223,100 @@ def test_parse_events_returns_dataclasses():
     assert second.last_modified is None
 
 
+def test_parse_events_handles_dates_timezones_and_alarms():
+    ics = textwrap.dedent(
+        """\
+        BEGIN:VCALENDAR
+        VERSION:2.0
+        BEGIN:VEVENT
+        UID:all-day
+        DTSTART;VALUE=DATE:20251208
+        DTEND;VALUE=DATE:20251209
+        SUMMARY:Turnier\\, Halle\\; Nord
+        DESCRIPTION:First line\\nsecond line that is
+          folded
+        BEGIN:VALARM
+        ACTION:DISPLAY
+        DESCRIPTION:Reminder
+        END:VALARM
+        END:VEVENT
+        BEGIN:VEVENT
+        UID:vienna
+        DTSTART;TZID=Europe/Vienna:20251206T093000
+        SUMMARY:Training
+        END:VEVENT
+        BEGIN:VEVENT
+        UID:no-start
+        SUMMARY:Skipped
+        END:VEVENT
+        END:VCALENDAR
+        """
+    )
+
+    all_day, vienna = parse_events(ics)
+
+    assert all_day.start == datetime(2025, 12, 8, tzinfo=timezone.utc)
+    assert all_day.end == datetime(2025, 12, 9, tzinfo=timezone.utc)
+    assert all_day.summary == "Turnier, Halle; Nord"
+    assert all_day.description == "First line\nsecond line that is folded"
+    assert vienna.start == datetime(2025, 12, 6, 8, 30, tzinfo=timezone.utc)
+    assert vienna.end == vienna.start
+
+
+def test_parse_events_resolves_feed_and_windows_timezones():
+    ics = textwrap.dedent(
+        """\
+        BEGIN:VCALENDAR
+        VERSION:2.0
+        BEGIN:VTIMEZONE
+        TZID:Custom/Club
+        BEGIN:STANDARD
+        DTSTART:16010101T030000
+        TZOFFSETFROM:+0200
+        TZOFFSETTO:+0100
+        RRULE:FREQ=YEARLY;BYDAY=-1SU;BYMONTH=10
+        END:STANDARD
+        BEGIN:DAYLIGHT
+        DTSTART:16010101T020000
+        TZOFFSETFROM:+0100
+        TZOFFSETTO:+0200
+        RRULE:FREQ=YEARLY;BYDAY=-1SU;BYMONTH=3
+        END:DAYLIGHT
+        END:VTIMEZONE
+        BEGIN:VEVENT
+        UID:winter
+        DTSTART;TZID=Custom/Club:20251206T093000
+        END:VEVENT
+        BEGIN:VEVENT
+        UID:summer
+        DTSTART;TZID=Custom/Club:20250701T093000
+        END:VEVENT
+        BEGIN:VEVENT
+        UID:outlook
+        DTSTART;TZID=W. Europe Standard Time:20251206T093000
+        END:VEVENT
+        END:VCALENDAR
+        """
+    )
+
+    winter, summer, outlook = parse_events(ics)
+
+    assert winter.start == datetime(2025, 12, 6, 8, 30, tzinfo=timezone.utc)
+    assert summer.start == datetime(2025, 7, 1, 7, 30, tzinfo=timezone.utc)
+    assert outlook.start == datetime(2025, 12, 6, 8, 30, tzinfo=timezone.utc)
+    assert "DTSTART:20251206T083000Z" in create_invitation(winter, "user@example.com")
+
+
+def test_parse_events_resolves_vtimezone_after_events():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        events = parse_events(club_ics())
+
+    assert [event.uid for event in events] == ["summer", "utc"]
+    assert events[0].start == datetime(2025, 7, 1, 7, 30, tzinfo=timezone.utc)
+    assert events[0].start.timestamp() == 1751355000
+
+
 def test_filter_events_by_date_range():
     events = [
         Event(
@@ -176,6 +357,39 @@ def test_filter_events_by_date_range():
     assert [event.uid for event in filtered] == ["within"]
 
 
+def test_filter_events_treats_naive_starts_as_utc(monkeypatch):
+    # A local timezone behind UTC would move naive starts into the window.
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        events = [
+            Event(
+                uid=uid,
+                summary="Training",
+                description="",
+                location="",
+                url="",
+                start=start,
+                end=start,
+            )
+            for uid, start in (
+                ("before", datetime(2024, 12, 31, 23, 30)),
+                ("within", datetime(2025, 1, 1, 0, 30)),
+            )
+        ]
+
+        filtered = filter_events(
+            events,
+            start=date(2025, 1, 1),
+            end=date(2025, 1, 1),
+        )
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    assert [event.uid for event in filtered] == ["within"]
+
+
 def test_filter_events_excludes_keywords():
     events = [
         Event(
@@ -239,6 +453,18 @@ def test_filter_events_excludes_additional_keywords():
     assert [event.uid for event in filtered] == ["keep"]
 
 
+def test_iter_filtered_events_filters_while_parsing():
+    events = iter_filtered_events(
+        sample_ics(),
+        start=datetime(2024, 12, 2, tzinfo=timezone.utc),
+        end=datetime(2024, 12, 31, tzinfo=timezone.utc),
+    )
+    assert [event.uid for event in events] == ["124"]
+
+    events = iter_filtered_events(sample_ics(), exclude_keywords=["second"])
+    assert [event.summary for event in events] == ["Sample Event"]
+
+
 def test_export_calendars_writes_files(monkeypatch, tmp_path: Path):
     urls = [
         "https://api.vereinsplaner.at/v1/public/ical/example.ics",
@@ -251,9 +477,9 @@ def test_export_calendars_writes_files(monkeypatch, tmp_path: Path):
     }
 
     def fake_fetch(url, timeout=10):
-        return responses[url]
+        return iter(responses[url].splitlines())
 
-    monkeypatch.setattr("ics_importer.inviter.fetch_ics", fake_fetch)
+    monkeypatch.setattr("ics_importer.inviter.fetch_ics_lines", fake_fetch)
 
     written = export_calendars(
         urls=urls,
@@ -360,7 +586,7 @@ def test_export_team_calendars_creates_team_files(monkeypatch, tmp_path: Path):
         """
     )
 
-    monkeypatch.setattr("ics_importer.inviter.fetch_ics", lambda url, timeout=10: ics)
+    monkeypatch.setattr("ics_importer.inviter.fetch_ics_lines", lambda url, timeout=10: iter(ics.splitlines()))
 
     written = export_team_calendars(
         urls=[url],
@@ -441,6 +667,56 @@ def test_create_invitation_contains_required_fields():
     assert "LAST-MODIFIED:20231202T130000Z" in invite
 
 
+def test_create_invitation_folds_long_lines_on_character_boundaries():
+    # Two-byte characters at odd offsets force cuts that would land mid-character.
+    summary = "Hallentraining " + "Übungsleiter Åsa " * 12
+    event = Event(
+        uid="fold",
+        summary=summary,
+        description="x" + "€" * 100,
+        location="",
+        url="",
+        start=datetime(2024, 12, 1, 14, 0, tzinfo=timezone.utc),
+        end=datetime(2024, 12, 1, 15, 0, tzinfo=timezone.utc),
+    )
+
+    invite = create_invitation(event, "user@example.com")
+    physical_lines = invite.encode("utf-8").split(b"\r\n")
+
+    assert max(len(line) for line in physical_lines) == 75
+    assert all(len(line) <= 75 for line in physical_lines)
+    for line in physical_lines:
+        line.decode("utf-8")
+    assert f"SUMMARY:{summary}" in unfold_ics(invite)
+    assert f"DESCRIPTION:x{'€' * 100}" in unfold_ics(invite)
+
+
+def test_create_invitation_escapes_text_and_parameters():
+    event = Event(
+        uid="escape",
+        summary="Turnier, Halle; Nord\\Süd\nLinie 2",
+        description="Bitte mitbringen:\nTrikot, Hose; Schuhe",
+        location="",
+        url="",
+        start=datetime(2024, 12, 1, 14, 0, tzinfo=timezone.utc),
+        end=datetime(2024, 12, 1, 15, 0, tzinfo=timezone.utc),
+    )
+
+    invite = unfold_ics(
+        create_invitation(
+            event,
+            attendee_email="user@example.com",
+            organizer_email="organizer@example.com",
+            attendee_name='Doe, "JJ": Coach',
+        )
+    )
+
+    assert "SUMMARY:Turnier\\, Halle\\; Nord\\\\Süd\\nLinie 2\n" in invite
+    assert "DESCRIPTION:Bitte mitbringen:\\nTrikot\\, Hose\\; Schuhe\n" in invite
+    assert "ATTENDEE;CN=\"Doe, 'JJ': Coach\";PARTSTAT=NEEDS-ACTION;" in invite
+    assert parse_events(invite)[0].summary == event.summary
+
+
 def test_generate_invites_writes_files(tmp_path: Path):
     events = parse_events(sample_ics())
 
@@ -460,6 +736,37 @@ def test_generate_invites_writes_files(tmp_path: Path):
         assert 'ATTENDEE;CN="User Example"' in content
 
 
+def test_generate_invites_numbers_repeated_and_colliding_uids(tmp_path: Path):
+    uids = ["a", "a_2", "a", "a", "b@x", "", "!!"]
+    events = [
+        Event(
+            uid=uid,
+            summary=f"Event {index}",
+            description="",
+            location="",
+            url="",
+            start=datetime(2024, 12, 1, 14, 0, tzinfo=timezone.utc),
+            end=datetime(2024, 12, 1, 15, 0, tzinfo=timezone.utc),
+        )
+        for index, uid in enumerate(uids)
+    ]
+
+    written = generate_invites(events, attendee_email="user@example.com", output_dir=tmp_path)
+
+    # "a_2" claims a_2.ics first, so the second "a" skips ahead to a_3.ics.
+    assert [path.name for path in written] == [
+        "a.ics",
+        "a_2.ics",
+        "a_3.ics",
+        "a_4.ics",
+        "bx.ics",
+        "event.ics",
+        "event_2.ics",
+    ]
+    for index, path in enumerate(written):
+        assert f"SUMMARY:Event {index}" in path.read_text()
+
+
 def test_import_invites_combines_sources_and_filters(monkeypatch, tmp_path: Path):
     urls = [
         "https://source.example/vereinsplaner.ics",
@@ -475,9 +782,9 @@ def test_import_invites_combines_sources_and_filters(monkeypatch, tmp_path: Path
 
     def fake_fetch(url, timeout=10):
         calls.append((url, timeout))
-        return responses[url]
+        return iter(responses[url].splitlines())
 
-    monkeypatch.setattr("ics_importer.inviter.fetch_ics", fake_fetch)
+    monkeypatch.setattr("ics_importer.inviter.fetch_ics_lines", fake_fetch)
 
     written = import_invites(
         urls=urls,
@@ -490,8 +797,100 @@ def test_import_invites_combines_sources_and_filters(monkeypatch, tmp_path: Path
         exclude_keywords=["U9", "U10"],
     )
 
-    assert calls == [(urls[0], 10), (urls[1], 10)]
+    # Feeds are fetched concurrently, so only the set of calls is deterministic.
+    assert sorted(calls) == sorted([(urls[0], 10), (urls[1], 10)])
     assert len(written) == 1
     assert written[0].name == "google-2025.ics"
     content = unfold_ics(written[0].read_text())
-    assert "SUMMARY:Google Event 2025" in content
\ No newline at end of file
+    assert "SUMMARY:Google Event 2025" in content
+
+
+def test_export_calendars_fetches_duplicate_urls_once(monkeypatch, tmp_path: Path):
+    url = "https://source.example/vereinsplaner.ics"
+    calls = []
+
+    def fake_fetch(url, timeout=10):
+        calls.append(url)
+        return iter(sample_ics().splitlines())
+
+    monkeypatch.setattr("ics_importer.inviter.fetch_ics_lines", fake_fetch)
+
+    written = export_calendars(urls=[url, url], output_dir=tmp_path)
+
+    assert calls == [url]
+    assert list(written) == [url]
+
+
+def test_export_calendars_reuses_cached_feed_on_not_modified(monkeypatch, tmp_path: Path):
+    url = "https://source.example/vereinsplaner.ics"
+    requests_seen = []
+
+    def fake_get(url, timeout, headers, stream):
+        assert stream
+        requests_seen.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return StreamingResponse(304)
+        return StreamingResponse(200, sample_ics())
+
+    monkeypatch.setattr("ics_importer.inviter._SESSION.get", fake_get)
+
+    cache_dir = tmp_path / "cache"
+    first = export_calendars([url], tmp_path / "first", cache_dir=cache_dir)
+    second = export_calendars([url], tmp_path / "second", cache_dir=cache_dir)
+
+    assert requests_seen == [{}, {"If-None-Match": '"v1"'}]
+    assert first[url].read_text().count("BEGIN:VEVENT") == 2
+    assert second[url].read_text().count("BEGIN:VEVENT") == 2
+
+
+def test_cached_feed_falls_back_to_unconditional_fetch(monkeypatch, tmp_path: Path):
+    url = "https://source.example/vereinsplaner.ics"
+    requests_seen = []
+    statuses = []
+
+    def fake_get(url, timeout, headers, stream):
+        assert stream
+        requests_seen.append(headers)
+        status_code = statuses.pop(0)
+        return StreamingResponse(status_code, sample_ics() if status_code == 200 else "")
+
+    monkeypatch.setattr("ics_importer.inviter._SESSION.get", fake_get)
+    cache_dir = tmp_path / "cache"
+
+    # A 304 without stored validators must not be taken as "empty feed".
+    statuses[:] = [304, 200]
+    first = export_calendars([url], tmp_path / "first", cache_dir=cache_dir)
+    assert requests_seen == [{}, {}]
+    assert first[url].read_text().count("BEGIN:VEVENT") == 2
+
+    # An unreadable pickle (here: unsupported protocol) is refetched.
+    for pickled in cache_dir.glob("*.pickle"):
+        pickled.write_bytes(b"\x80\x7f")
+    requests_seen.clear()
+    statuses[:] = [304, 200]
+    second = export_calendars([url], tmp_path / "second", cache_dir=cache_dir)
+    assert requests_seen == [{"If-None-Match": '"v1"'}, {}]
+    assert second[url].read_text().count("BEGIN:VEVENT") == 2
+
+
+def test_cached_feed_round_trips_feed_defined_timezone(monkeypatch, tmp_path: Path):
+    url = "https://source.example/club.ics"
+    requests_seen = []
+
+    def fake_get(url, timeout, headers, stream):
+        assert stream
+        requests_seen.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return StreamingResponse(304)
+        return StreamingResponse(200, club_ics())
+
+    monkeypatch.setattr("ics_importer.inviter._SESSION.get", fake_get)
+
+    cache_dir = tmp_path / "cache"
+    first = export_calendars([url], tmp_path / "first", cache_dir=cache_dir)
+    second = export_calendars([url], tmp_path / "second", cache_dir=cache_dir)
+
+    # The cached events unpickle, so the 304 is honoured without a refetch.
+    assert requests_seen == [{}, {"If-None-Match": '"v1"'}]
+    assert "DTSTART:20250701T073000Z" in first[url].read_text()
+    assert second[url].read_text() == first[url].read_text()